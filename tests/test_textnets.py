@@ -3,13 +3,18 @@
 """Tests for `textnets` package."""
 
 import sqlite3
+import sys
+import types
 
+import igraph as ig
 import numpy as np
 
 import pandas as pd
 import textnets as tn
 
 from pytest import approx, mark
+from scipy.integrate import quad
+from scipy.sparse import csr_array
 from toolz import partial
 
 
@@ -197,6 +202,21 @@ def test_textnet_save_and_load(corpus, tmp_path):
     assert net.summary == loaded.summary
 
 
+def test_textnet_load_legacy(corpus, tmp_path):
+    """Test loading a textnet saved with a dense incidence matrix table."""
+    out = tmp_path / "legacy.textnet"
+    net = tn.Textnet(corpus.tokenized())
+    meta = {"connected": False, "doc_attrs": "null"}
+    with sqlite3.connect(out) as conn:
+        net.m.T.to_sql("textnet_im", conn)
+        pd.Series(meta, name="values").to_sql("textnet_meta", conn, index_label="keys")
+    loaded = tn.load_textnet(out)
+    assert list(loaded.m.index) == list(net.m.index)
+    assert list(loaded.m.columns) == list(net.m.columns)
+    assert loaded.m.to_numpy() == approx(net.m.to_numpy())
+    assert net.summary == loaded.summary
+
+
 def test_config_save_and_load(tmp_path):
     """Test roundtrip of saving and loading configuration parameters."""
     out = tmp_path / "out.params"
@@ -216,6 +236,8 @@ def test_textnet(corpus):
     n_np = tn.Textnet(noun_phrases)
     assert n_np.graph.vcount() > 0
     assert n_np.graph.ecount() > 0
+    assert n_np.node_types.dtype == bool
+    assert n_np.node_types.sum() == len(n_np.m.columns)
     g_np_groups = n_np.project(node_type=tn.DOC)
     assert g_np_groups.vcount() > 0
     assert g_np_groups.ecount() > 0
@@ -236,6 +258,35 @@ def test_textnet_matrix(corpus):
     )
 
 
+def test_textnet_sparse_matrix(corpus):
+    """Test that the sparse-backed matrix agrees with a dense pivot."""
+    tokenized = corpus.tokenized()
+    n = tn.Textnet(tokenized, min_docs=1)
+    pivot = (
+        tokenized.reset_index()
+        .pivot(index="label", columns="term", values="term_weight")
+        .fillna(0)
+    )
+    pd.testing.assert_frame_equal(n.m._df, pivot, check_names=False)
+    assert n.ecount() == (pivot > 0).sum().sum()
+    assert n.m.density == approx(n.ecount() / pivot.size)
+    empty = tn.Textnet(tokenized, min_docs=len(n.m.index) + 1)
+    assert empty.m.empty
+    assert np.isnan(empty.m.density)
+
+
+def test_textnet_sparse_stored_zeros():
+    """Test that explicitly stored zeros do not become edges."""
+    a = csr_array((np.array([1.0, 0.0, 2.0]), ([0, 0, 1], [0, 1, 1])), shape=(2, 2))
+    m = tn.network.BiadjacencyMatrix.from_sparse(
+        a, index=pd.Index(["d1", "d2"]), columns=pd.Index(["t1", "t2"])
+    )
+    a.data[0] = 99
+    n = tn.Textnet(m)
+    assert n.graph.get_edgelist() == [(0, 2), (1, 3)]
+    assert n.edges["weight"] == [1.0, 2.0]
+
+
 def test_textnet_remove_weak_edges(corpus):
     """Test removing weak edges."""
     noun_phrases = corpus.noun_phrases()
@@ -251,6 +302,85 @@ def test_textnet_cluster_strength(corpus):
     assert n_np.cluster_strength.shape[0] > 0
 
 
+def test_textnet_top_cluster_nodes(corpus):
+    """Test that ranked cluster nodes follow changes to the partition."""
+    n = tn.Textnet(corpus.tokenized())
+    top = n.top_cluster_nodes(n=2)
+    assert top["size"].sum() == n.vcount()
+    assert len(top["nodes"].iloc[0]) == 2
+    n.clusters = [0] * n.vcount()
+    assert len(n.top_cluster_nodes()) == 1
+
+
+def test_textnet_top_nodes(corpus):
+    """Test that top nodes match a full sort of the measure."""
+    n = tn.Textnet(corpus.tokenized())
+    expected = n.degree.sort_values(ascending=False, kind="stable").head(5)
+    assert n.top_degree(5).equals(expected)
+
+
+def test_textnet_partition_reuse(corpus):
+    """Test that partitions are reused when parameters are revisited."""
+    n = tn.Textnet(corpus.tokenized())
+    first = n.clusters
+    resolution = tn.params["resolution_parameter"]
+    tn.params["resolution_parameter"] = resolution * 2
+    try:
+        del n.clusters
+        assert n.clusters is not first
+    finally:
+        tn.params["resolution_parameter"] = resolution
+    del n.clusters
+    assert n.clusters is first
+
+
+def test_textnet_cugraph_fallback(corpus, monkeypatch, recwarn):
+    """Test that the cuGraph backend falls back to leidenalg."""
+    n = tn.Textnet(corpus.tokenized())
+    expected = n.project(node_type=tn.DOC).clusters.membership
+    monkeypatch.setitem(tn.params, "leiden_backend", "cugraph")
+    monkeypatch.setitem(sys.modules, "cugraph", None)
+    assert n.project(node_type=tn.DOC).clusters.membership == expected
+    assert n.clusters is not None
+    messages = [str(w.message) for w in recwarn if w.category is UserWarning]
+    assert "Could not import cuGraph. Using leidenalg." in messages
+    assert "cuGraph cannot partition bipartite networks. Using leidenalg." in messages
+
+
+def test_textnet_cugraph(monkeypatch):
+    """Test wrapping of cuGraph partitions using stand-in modules."""
+
+    class EdgeList:
+        def __init__(self, data):
+            self.df = pd.DataFrame(data)
+
+    class Graph:
+        def from_cudf_edgelist(self, edges, **kwargs):
+            self.edges = edges.df
+
+    class Parts:
+        def __init__(self, vertices):
+            self.vertices = vertices
+
+        def to_pandas(self):
+            return pd.DataFrame({"vertex": self.vertices, "partition": 0})
+
+    def leiden(g, random_state):
+        return Parts(np.union1d(g.edges["src"], g.edges["dst"])), 0.0
+
+    cudf = types.SimpleNamespace(DataFrame=EdgeList)
+    cugraph = types.SimpleNamespace(Graph=Graph, leiden=leiden)
+    monkeypatch.setitem(sys.modules, "cudf", cudf)
+    monkeypatch.setitem(sys.modules, "cugraph", cugraph)
+    monkeypatch.setitem(tn.params, "leiden_backend", "cugraph")
+    g = ig.Graph(n=5, edges=[(0, 1), (1, 2)])
+    g.vs["id"] = list("abcde")
+    g.es["weight"] = [1.0, 2.0]
+    clusters = tn.network.ProjectedTextnet(g).clusters
+    assert isinstance(clusters, ig.VertexClustering)
+    assert clusters.membership == [0, 0, 0, 1, 2]
+
+
 def test_textnet_birank(corpus):
     """Test calculating BiRank."""
 
@@ -288,6 +418,70 @@ def test_textnet_spanning(corpus):
     assert len(g_np_groups.spanning) == g_np_groups.graph.vcount()
 
 
+def _reference_alpha(g):
+    """Disparity filter scores computed edge by edge with numerical integration."""
+    scores = []
+    for edge in g.es:
+        alpha = 1.0
+        for node in edge.vertex_tuple:
+            k = node.degree()
+            if k > 1:
+                w = edge["weight"] / node.strength(weights="weight")
+                integral, _ = quad(lambda x: (1 - x) ** (k - 2), 0, w)
+                alpha = min(alpha, 1 - (k - 1) * integral)
+        scores.append(alpha)
+    return scores
+
+
+def test_textnet_alpha_cut(corpus):
+    """Test that backbones are scored on their own graph."""
+
+    papers = tn.Textnet(corpus.tokenized()).project(node_type=tn.TERM)
+    backbone = papers.alpha_cut(0.5)
+    assert papers.edges["alpha"] == approx(_reference_alpha(papers.graph))
+    assert "alpha" not in backbone.graph.edge_attributes()
+    fresh = tn.network.ProjectedTextnet(backbone.graph.copy())
+    pruned = backbone.alpha_cut(0.3)
+    assert backbone.edges["alpha"] == approx(_reference_alpha(backbone.graph))
+    assert pruned.ecount() == fresh.alpha_cut(0.3).ecount()
+
+
+def test_disparity_filter_closed_form():
+    """Test the closed-form significance against numerical integration."""
+
+    for k in (2, 3, 5, 10):
+        for w in (0.05, 0.3, 0.5, 0.9):
+            integral, _ = quad(lambda x: (1 - x) ** (k - 2), 0, w)
+            expected = 1 - (k - 1) * integral
+            alpha = tn.network._disparity_filter_alpha(np.array([w]), np.array([k]))
+            assert alpha[0] == approx(expected, abs=1e-9)
+
+
+def test_disparity_filter_leaves():
+    """Test that edges of leaf nodes are scored from the other endpoint."""
+
+    g = ig.Graph([(0, 1), (1, 2)])
+    g.es["weight"] = [1, 3]
+    assert list(tn.network.disparity_filter(g)) == approx([0.75, 0.25])
+
+
+def test_textnet_parallel_centrality(corpus):
+    """Test that parallel path centralities match the serial computation."""
+
+    n = tn.Textnet(corpus.tokenized())
+    serial = n.project(node_type=tn.TERM)
+    n_jobs = tn.params["n_jobs"]
+    try:
+        tn.params["n_jobs"] = 2
+        parallel = n.project(node_type=tn.TERM)
+        assert parallel.betweenness.to_numpy() == approx(serial.betweenness.to_numpy())
+        assert parallel.closeness.to_numpy() == approx(
+            serial.closeness.to_numpy(), nan_ok=True
+        )
+    finally:
+        tn.params["n_jobs"] = n_jobs
+
+
 @mark.xfail(
     raises=ModuleNotFoundError, reason="experimental feature requires additional import"
 )
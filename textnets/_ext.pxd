@@ -1 +0,0 @@
-cdef double df_integrand(int, double[2]) nogil
@@ -11,6 +11,11 @@ Global Parameters
   If True, **textnets** should attempt to download any required language
   models.
 
+``centrality_cutoff`` (default: None)
+  If set, only consider paths up to this length (in terms of inverse edge
+  weights) when calculating betweenness and closeness centrality. This gives
+  a faster approximation on large networks.
+
 ``ffca_cutoff`` (default: 0.3)
   Membership degree threshold (*alpha*) for concept lattice (see
   :cite:t:`Tho2006`).
@@ -18,6 +23,19 @@ Global Parameters
 ``lang`` (default: en_core_web_sm)
   Default language model to use.
 
+``leiden_backend`` (default: leidenalg)
+  Implementation of the Leiden algorithm used to detect communities in
+  projected networks. Set to ``cugraph`` to run it on a GPU if
+  `cuGraph <https://docs.rapids.ai/api/cugraph/stable/>`__ is installed.
+  Bipartite networks are always partitioned using ``leidenalg``.
+
+``n_jobs`` (default: 1)
+  Number of worker processes to use when calculating betweenness and closeness
+  centrality. Set to -1 to use all available cores. On macOS and Windows,
+  worker processes are started with *spawn*, so each one imports **textnets**
+  (and spaCy) afresh, and scripts need to guard their entry point with
+  ``if __name__ == "__main__":``.
+
 ``progress_bar`` (default: True)
   If True, display a progress bar for long-running tasks in interactive use.
 
@@ -53,8 +71,11 @@ class TextnetsConfiguration(UserDict):
 
     _valid = {
         "autodownload",
+        "centrality_cutoff",
         "ffca_cutoff",
         "lang",
+        "leiden_backend",
+        "n_jobs",
         "progress_bar",
         "resolution_parameter",
         "seed",
@@ -126,8 +147,11 @@ class TextnetsConfiguration(UserDict):
 
 default_params = {
     "autodownload": False,
+    "centrality_cutoff": None,
     "ffca_cutoff": 0.3,
     "lang": "en_core_web_sm",
+    "leiden_backend": "leidenalg",
+    "n_jobs": 1,
     "progress_bar": True,
     "resolution_parameter": 0.1,
     "tuning_parameter": 0.5,
@@ -5,25 +5,21 @@ from __future__ import annotations
 import json
 import os
 import sqlite3
-import warnings
 from abc import ABC, abstractmethod
-from collections import Counter
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from enum import Flag
-from functools import cached_property
+from functools import cached_property, partial
 from os import cpu_count
 from pathlib import Path
 from typing import Any, Callable, IO, Iterator, Literal
 from warnings import warn
 
 import igraph as ig
-import leidenalg as la
 import numpy as np
 import pandas as pd
-from scipy import LowLevelCallable
-from scipy.integrate import quad
-from toolz import memoize
-from tqdm.auto import tqdm
-from tqdm.contrib.concurrent import thread_map
+from scipy.sparse import coo_array, csr_array, sparray
+from toolz import concat
 
 import textnets as tn
 from ._util import LiteFrame
@@ -32,19 +28,6 @@ from .corpus import TidyText
 from .fca import FormalContext
 from .viz import decorate_plot
 
-try:
-    from . import _ext  # type: ignore
-
-    integrand = LowLevelCallable.from_cython(_ext, "df_integrand")
-except ImportError:
-
-    def integrand(x: float, degree: int) -> np.float64:
-        """Fallback version of integrand function for the disparity filter."""
-        return np.float64(1 - x) ** (degree - 2)
-
-    warn("Could not import compiled extension, backbone extraction will be slow.")
-
-
 #: Flag to distinguish node types.
 NodeType = Flag("NodeType", [("TERM", True), ("DOC", False)])
 TERM = NodeType.TERM
@@ -55,7 +38,7 @@ def _make_top(prop, desc):
     """Helper function to create top_* methods for Textnet classes."""
 
     def method(cls, n=10):
-        return getattr(cls, prop).sort_values(ascending=False).head(n)
+        return _top_values(getattr(cls, prop), n)
 
     method.__doc__ = f"""
         Show nodes sorted by {desc}.
@@ -73,6 +56,19 @@ def _make_top(prop, desc):
     return method
 
 
+def _top_values(series: pd.Series, n: int) -> pd.Series:
+    """Return the ``n`` largest values without sorting the whole series."""
+    values = series.to_numpy(dtype="float64")
+    if not 0 < n < len(values):
+        return series.sort_values(ascending=False, kind="stable").head(n)
+    key = np.where(np.isnan(values), np.inf, -values)  # missing values go last
+    kth = np.partition(key, n - 1)[n - 1]
+    idx = np.flatnonzero(key < kth)
+    # Break ties at the cutoff by node order so the result is deterministic
+    idx = np.append(idx, np.flatnonzero(key == kth)[: n - len(idx)])
+    return series.iloc[idx[np.argsort(key[idx], kind="stable")]]
+
+
 class TextnetBase(ABC):
     """
     Abstract base class for `Textnet` and `ProjectedTextnet`.
@@ -127,20 +123,40 @@ class TextnetBase(ABC):
         """
         self.graph.write(target, format)
 
+    @cached_property
+    def _ids(self) -> pd.Index:
+        return pd.Index(self.nodes["id"])
+
+    @cached_property
+    def _edge_array(self) -> np.ndarray:
+        return np.array(self.graph.get_edgelist(), dtype=int).reshape(-1, 2)
+
+    @property
+    def _edge_src(self) -> np.ndarray:
+        return self._edge_array[:, 0]
+
+    @property
+    def _edge_tgt(self) -> np.ndarray:
+        return self._edge_array[:, 1]
+
+    @cached_property
+    def _edge_weights(self) -> np.ndarray:
+        return np.array(self.edges["weight"], dtype="float64")
+
     @cached_property
     def degree(self) -> pd.Series:
         """Unweighted node degree."""
-        return pd.Series(self.graph.degree(), index=self.nodes["id"])
+        return pd.Series(self.graph.degree(), index=self._ids)
 
     @cached_property
     def strength(self) -> pd.Series:
         """Weighted node degree."""
-        return pd.Series(self.graph.strength(weights="weight"), index=self.nodes["id"])
+        return pd.Series(self.graph.strength(weights="weight"), index=self._ids)
 
     @cached_property
-    def node_types(self) -> list[NodeType]:
-        """Return list of node types."""
-        return [TERM if t == "term" else DOC for t in self.nodes["type"]]
+    def node_types(self) -> np.ndarray:
+        """Return boolean array of node types (`True` for term nodes)."""
+        return np.asarray(self.nodes["type"]) == "term"
 
     @abstractmethod
     def plot(self, **kwargs) -> ig.Plot:
@@ -151,6 +167,9 @@ class TextnetBase(ABC):
         pass
 
     _partition: ig.VertexClustering | None = None
+    _partitions: dict[tuple[float, int, str], ig.VertexClustering] | None = None
+    _membership: list[int] | None = None
+    _ranked_nodes: dict[str, pd.DataFrame] | None = None
 
     @property
     def clusters(self) -> ig.VertexClustering:
@@ -161,10 +180,20 @@ class TextnetBase(ABC):
         partition that was supplied to the setter.
         """
         if self._partition is None:
-            self._partition = self._partition_graph(
-                resolution=tn.params["resolution_parameter"],
-                seed=tn.params["seed"],
+            # Keep detected partitions so that parameter sweeps can revisit
+            # earlier settings without running Leiden again
+            if self._partitions is None:
+                self._partitions = {}
+            key = (
+                tn.params["resolution_parameter"],
+                tn.params["seed"],
+                tn.params["leiden_backend"],
             )
+            if key not in self._partitions:
+                self._partitions[key] = self._partition_graph(
+                    resolution=key[0], seed=key[1]
+                )
+            self._partition = self._partitions[key]
         return self._partition
 
     @clusters.setter
@@ -188,15 +217,26 @@ class TextnetBase(ABC):
             self._partition = part
         else:
             raise ValueError("No valid clusters supplied.")
+        self._membership = None
+        self._ranked_nodes = None
 
     @clusters.deleter
     def clusters(self) -> None:
         self._partition = None
+        self._membership = None
+        self._ranked_nodes = None
+
+    @property
+    def _cluster_membership(self) -> list[int]:
+        # VertexClustering.membership returns a fresh copy on every access
+        if self._membership is None:
+            self._membership = self.clusters.membership
+        return self._membership
 
     @property
     def modularity(self) -> float:
         """Return modularity based on graph partition."""
-        return self.graph.modularity(self.clusters, weights="weight")
+        return self.graph.modularity(self._cluster_membership, weights="weight")
 
     @property
     def cluster_strength(self) -> pd.Series:
@@ -242,19 +282,26 @@ class TextnetBase(ABC):
             Clusters with representative nodes.
         """
         return (
-            pd.DataFrame(
-                {
-                    "nodes": self.nodes["id"],
-                    "metric": getattr(self, rank_nodes_by),
-                    "cluster": self.clusters.membership,
-                }
-            )
-            .sort_values("metric", ascending=False)
+            self._ranked_cluster_nodes(rank_nodes_by)
             .groupby("cluster")
             .agg({"nodes": lambda x: x[:n], "metric": len})
             .rename(columns={"metric": "size"})
         )
 
+    def _ranked_cluster_nodes(self, rank_nodes_by: str) -> pd.DataFrame:
+        # Sorted nodes are cached per metric until the partition changes.
+        if self._ranked_nodes is None:
+            self._ranked_nodes = {}
+        if rank_nodes_by not in self._ranked_nodes:
+            self._ranked_nodes[rank_nodes_by] = pd.DataFrame(
+                {
+                    "nodes": self.nodes["id"],
+                    "metric": getattr(self, rank_nodes_by),
+                    "cluster": self._cluster_membership,
+                }
+            ).sort_values("metric", ascending=False)
+        return self._ranked_nodes[rank_nodes_by]
+
     @decorate_plot
     def _plot(
         self,
@@ -263,15 +310,20 @@ class TextnetBase(ABC):
         tn.init_seed()
         return ig.plot(self.graph, **kwargs)
 
+    @cached_property
+    def _type_counts(self) -> tuple[int, int]:
+        terms = int(np.count_nonzero(self.node_types))
+        return self.vcount() - terms, terms
+
     def __repr__(self) -> str:
-        type_counts: Counter[Literal["doc", "term"]] = Counter(self.nodes["type"])
+        docs, terms = self._type_counts
         return (
-            f"""<{self.__class__.__name__} with {type_counts["doc"]} documents, """
-            + f"""{type_counts["term"]} terms, and {self.ecount()} edges>"""
+            f"""<{self.__class__.__name__} with {docs} documents, """
+            + f"""{terms} terms, and {self.ecount()} edges>"""
         )
 
     def _repr_html_(self) -> str:
-        type_counts: Counter[Literal["doc", "term"]] = Counter(self.nodes["type"])
+        docs, terms = self._type_counts
         return f"""
             <style scoped>
               .full-width {{ width: 100%; }}
@@ -285,13 +337,13 @@ class TextnetBase(ABC):
                   <svg width="1ex" height="1ex">
                     <rect width="1ex" height="1ex" fill="dodgerblue">
                   </svg>
-                  Docs: {type_counts["doc"]}
+                  Docs: {docs}
                 </td>
                 <td style="color: orangered;">
                   <svg width="1ex" height="1ex">
                     <circle cx="50%" cy="50%" r="50%" fill="orangered">
                   </svg>
-                  Terms: {type_counts["term"]}
+                  Terms: {terms}
                 </td>
                 <td style="color: darkgray;">
                   <svg width="2ex" height="1ex">
@@ -353,7 +405,7 @@ class Textnet(TextnetBase, FormalContext):
         self,
         data: TidyText | BiadjacencyMatrix | pd.DataFrame,
         min_docs: int = 2,
-        max_docs: int = float('inf'),
+        max_docs: int = float("inf"),
         connected: bool = False,
         remove_weak_edges: bool = False,
         doc_attrs: dict[str, dict[str, Any]] | None = None,
@@ -367,13 +419,17 @@ class Textnet(TextnetBase, FormalContext):
         elif isinstance(data, (TidyText, pd.DataFrame)):
             self._matrix = _matrix_from_tidy_text(data, min_docs, max_docs)
         if remove_weak_edges:
-            pairs: pd.Series = self._matrix.stack()
-            edge_weights: pd.Series = pairs[pairs > 0]
-            iqr: float = edge_weights.quantile(0.75) - edge_weights.quantile(0.25)
-            cutoff: float = edge_weights.median() - 1.5 * iqr
+            sparse = self._matrix._sparse
+            edge_weights = sparse.data[sparse.data > 0]
+            q1, median, q3 = np.quantile(edge_weights, [0.25, 0.5, 0.75])
+            cutoff: float = median - 1.5 * (q3 - q1)
             if cutoff > 0:
-                self._matrix = BiadjacencyMatrix(
-                    self._matrix[self._matrix > cutoff].dropna(how="all").fillna(0)
+                pruned = sparse.multiply(sparse > cutoff).tocsr()
+                rows = np.flatnonzero(pruned.getnnz(axis=1))
+                self._matrix = BiadjacencyMatrix.from_sparse(
+                    pruned[rows],
+                    index=self._matrix.index[rows],
+                    columns=self._matrix.columns,
                 )
 
     @cached_property
@@ -392,16 +448,18 @@ class Textnet(TextnetBase, FormalContext):
         """Weighted bipartite adjacency matrix of the bipartite graph."""
         if not self._connected:
             return self._matrix
-        a = np.array(self.graph.get_biadjacency(types=self.node_types)[0]).astype(
-            "float64"
+        doc_count = self.vcount() - int(np.count_nonzero(self.node_types))
+        edges = np.sort(self._edge_array, axis=1)
+        a = coo_array(
+            (self._edge_weights, (edges[:, 0], edges[:, 1] - doc_count)),
+            shape=(doc_count, self.vcount() - doc_count),
         )
-        a[a == 1] = self.edges["weight"]
-        doc_count, _ = a.shape
-        m = BiadjacencyMatrix(
-            a, index=self.nodes["id"][:doc_count], columns=self.nodes["id"][doc_count:]
+        ids = self.nodes["id"]
+        return BiadjacencyMatrix.from_sparse(
+            a,
+            index=pd.Index(ids[:doc_count], name=self._matrix.index.name),
+            columns=pd.Index(ids[doc_count:], name="term"),
         )
-        m.T.index.name = "term"
-        return m
 
     def project(
         self,
@@ -433,26 +491,26 @@ class Textnet(TextnetBase, FormalContext):
         if not isinstance(node_type, NodeType) and node_type not in {"doc", "term"}:
             raise ValueError("No valid node_type specified.")
         graph_to_return = 0
+        sparse_array = self.m.to_sparse_array()
         if node_type in (TERM, "term"):
             graph_to_return = 1
-            sparse_array = self.m.to_sparse_array()
             weights = sparse_array.T @ sparse_array
         else:
-            array = self.m.to_array()
-            weights = array @ array.T
+            weights = sparse_array @ sparse_array.T
         g = self.graph.bipartite_projection(
             types=self.node_types, which=graph_to_return
         )
-        pairs = [
-            (s.index, t.index) for s, t in (g.es[i].vertex_tuple for i in g.es.indices)
-        ]
-        g.es.set_attribute_values("weight", [weights[i] for i in pairs])
-        g.es["cost"] = [
-            1 / pow(w, tn.params["tuning_parameter"]) for w in g.es["weight"]
-        ]
+        projected = ProjectedTextnet(g)
+        source, target = projected._edge_src, projected._edge_tgt
+        # Gathering from an empty selection would return a sparse array
+        edge_weights = weights[source, target] if g.ecount() else np.array([])
+        edge_weights = edge_weights.astype("float64")
+        g.es["weight"] = _float_values(edge_weights)
+        g.es["cost"] = _float_values(_edge_cost(edge_weights))
         if connected:
-            g = giant_component(g)
-        return ProjectedTextnet(g)
+            return ProjectedTextnet(giant_component(g))
+        projected._edge_weights = edge_weights
+        return projected
 
     def save(self, target: os.PathLike[Any] | str) -> None:
         """
@@ -466,9 +524,26 @@ class Textnet(TextnetBase, FormalContext):
         """
         conn = sqlite3.connect(Path(target))
         meta = {"connected": self._connected, "doc_attrs": json.dumps(self._doc_attrs)}
-        with conn, warnings.catch_warnings():
-            warnings.simplefilter("ignore")  # catch warning from pandas.to_sql
-            self.m.T.to_sql("textnet_im", conn, if_exists="replace")
+        coo = self.m._sparse.tocoo()
+        labels = [("doc", pos, label) for pos, label in enumerate(self.m.index)] + [
+            ("term", pos, label) for pos, label in enumerate(self.m.columns)
+        ]
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        with conn:
+            for table in ("textnet_im", "textnet_im_coo", "textnet_im_idx"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(
+                "CREATE TABLE textnet_im_coo (row INTEGER, col INTEGER, value REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE textnet_im_idx (axis TEXT, pos INTEGER, label TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO textnet_im_coo VALUES (?, ?, ?)",
+                zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist()),
+            )
+            conn.executemany("INSERT INTO textnet_im_idx VALUES (?, ?, ?)", labels)
             pd.Series(meta, name="values").to_sql(
                 "textnet_meta", conn, if_exists="replace", index_label="keys"
             )
@@ -497,13 +572,17 @@ class Textnet(TextnetBase, FormalContext):
             raise FileNotFoundError(f"File '{source}' does not exist.")
         conn = sqlite3.connect(Path(source))
         with conn as c:
-            m = pd.read_sql("SELECT * FROM textnet_im", c, index_col="term")
+            if _has_table(c, "textnet_im_coo"):
+                m = _read_sparse_matrix(c)
+            else:  # files written by earlier versions store a dense table
+                im = pd.read_sql("SELECT * FROM textnet_im", c, index_col="term")
+                m = BiadjacencyMatrix(im.T)
             meta = pd.read_sql("SELECT * FROM textnet_meta", c, index_col="keys")[
                 "values"
             ]
         connected = meta["connected"] == "1"
         doc_attrs = json.loads(meta["doc_attrs"])
-        return cls(BiadjacencyMatrix(m.T), connected=connected, doc_attrs=doc_attrs)
+        return cls(m, connected=connected, doc_attrs=doc_attrs)
 
     def plot(
         self,
@@ -646,9 +725,13 @@ class Textnet(TextnetBase, FormalContext):
             if cc > 0:
                 cc /= len(son)
             ccs.append(cc)
-        return pd.Series(ccs, index=self.nodes["id"])
+        return pd.Series(ccs, index=self._ids)
 
     def _partition_graph(self, resolution: float, seed: int) -> ig.VertexClustering:
+        if tn.params["leiden_backend"] == "cugraph":
+            warn("cuGraph cannot partition bipartite networks. Using leidenalg.")
+        import leidenalg as la
+
         part, part0, part1 = la.CPMVertexPartition.Bipartite(
             self.graph, resolution_parameter_01=resolution, weights="weight"
         )
@@ -690,41 +773,41 @@ class ProjectedTextnet(TextnetBase):
             edge = self.graph.es[i]
             source, target = edge.source, edge.target
             m[source, target] = m[target, source] = edge["weight"]
-        return pd.DataFrame(m, index=self.nodes["id"], columns=self.nodes["id"])
+        return pd.DataFrame(m, index=self._ids, columns=self._ids)
 
     @cached_property
     def betweenness(self) -> pd.Series:
         """Weighted betweenness centrality."""
-        return pd.Series(self.graph.betweenness(weights="cost"), index=self.nodes["id"])
+        return pd.Series(_path_centrality(self.graph, "betweenness"), index=self._ids)
 
     @cached_property
     def closeness(self) -> pd.Series:
         """Weighted closeness centrality."""
-        return pd.Series(self.graph.closeness(weights="cost"), index=self.nodes["id"])
+        return pd.Series(_path_centrality(self.graph, "closeness"), index=self._ids)
 
     @cached_property
     def harmonic(self) -> pd.Series:
         """Weighted harmonic centrality."""
         return pd.Series(
-            self.graph.harmonic_centrality(weights="cost"), index=self.nodes["id"]
+            self.graph.harmonic_centrality(weights="cost"), index=self._ids
         )
 
     @cached_property
     def eigenvector_centrality(self) -> pd.Series:
         """Weighted eigenvector centrality."""
         return pd.Series(
-            self.graph.eigenvector_centrality(weights="weight"), index=self.nodes["id"]
+            self.graph.eigenvector_centrality(weights="weight"), index=self._ids
         )
 
     @cached_property
     def pagerank(self) -> pd.Series:
         """Weighted PageRank centrality."""
-        return pd.Series(self.graph.pagerank(weights="weight"), index=self.nodes["id"])
+        return pd.Series(self.graph.pagerank(weights="weight"), index=self._ids)
 
     @property
     def spanning(self) -> pd.Series:
         """Textual spanning measure."""
-        if any(self.node_types):
+        if self.node_types.any():
             warn("Textual spanning is only defined for document nodes.")
         if not self.graph.is_connected():
             warn(
@@ -732,7 +815,7 @@ class ProjectedTextnet(TextnetBase):
                 "The textual spanning measure is not effective on disconnected graphs."
             )
         a = self.m.to_numpy()
-        return pd.Series(textual_spanning(a), index=self.nodes["id"])
+        return pd.Series(textual_spanning(a), index=self._ids)
 
     def alpha_cut(self, alpha: float) -> ProjectedTextnet:
         """
@@ -749,10 +832,18 @@ class ProjectedTextnet(TextnetBase):
         `ProjectedTextnet`
             New textnet sans pruned edges.
         """
-        if "alpha" not in self.graph.vertex_attributes():
-            self.graph.es["alpha"] = list(disparity_filter(self.graph))
+        if "alpha" not in self.graph.edge_attributes():
+            alpha_values = _disparity_filter_scores(
+                self._edge_src,
+                self._edge_tgt,
+                self._edge_weights,
+                self.degree.to_numpy(),
+                self.strength.to_numpy(),
+            )
+            self.graph.es["alpha"] = _float_values(alpha_values)
         pruned = self.graph.copy()
         pruned.delete_edges(pruned.es.select(alpha_ge=alpha))
+        del pruned.es["alpha"]  # scores are only valid for this graph
         return ProjectedTextnet(giant_component(pruned))
 
     def plot(self, *, alpha: float | None = None, **kwargs) -> ig.Plot:
@@ -791,6 +882,13 @@ class ProjectedTextnet(TextnetBase):
         return to_plot._plot(**kwargs)
 
     def _partition_graph(self, resolution: float, seed: int) -> ig.VertexClustering:
+        if tn.params["leiden_backend"] == "cugraph":
+            try:
+                return _partition_graph_cugraph(self.graph, seed)
+            except ImportError:
+                warn("Could not import cuGraph. Using leidenalg.")
+        import leidenalg as la
+
         part = la.find_partition(
             self.graph,
             la.ModularityVertexPartition,
@@ -819,28 +917,66 @@ def _matrix_from_tidy_text(
 ) -> BiadjacencyMatrix:
     if min_docs > max_docs:
         raise ValueError(f"'{min_docs}' min_docs exceeds '{max_docs}' max_docs.")
-    count = tidy_text.groupby("term").count()["n"]
-    filter_condition = (count >= min_docs) & (count <= max_docs)
-    tt = (
-        tidy_text.reset_index()
-        .merge(filter_condition, on="term", how="left")
-        .rename(columns={"n_y": "keep", "n_x": "n"})
+    term_codes, terms = pd.factorize(tidy_text["term"], sort=True)
+    count = np.bincount(term_codes, minlength=len(terms))
+    keep_term = (count >= min_docs) & (count <= max_docs)
+    keep = keep_term[term_codes]
+    tt = tidy_text[keep]
+    doc_codes, docs = pd.factorize(tt.index, sort=True)
+    # Renumber the surviving terms instead of factorizing a second time
+    term_codes = (np.cumsum(keep_term) - 1)[term_codes[keep]]
+    terms = terms[keep_term]
+    first = ~pd.MultiIndex.from_arrays([doc_codes, term_codes]).duplicated()
+    m = coo_array(
+        (
+            tt["term_weight"].to_numpy(dtype="float64")[first],
+            (doc_codes[first], term_codes[first]),
+        ),
+        shape=(len(docs), len(terms)),
+    ).tocsr()
+    return BiadjacencyMatrix.from_sparse(
+        m,
+        index=pd.Index(docs, name=tt.index.name),
+        columns=pd.Index(terms, name="term"),
     )
-    m = (
-        tt[tt["keep"]]
-        .groupby(["label", "term"])
-        .first()["term_weight"]
-        .astype(pd.SparseDtype("float"))
-        .unstack(fill_value=0)
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+    return conn.execute(query, (name,)).fetchone() is not None
+
+
+def _read_sparse_matrix(conn: sqlite3.Connection) -> BiadjacencyMatrix:
+    idx = pd.read_sql("SELECT * FROM textnet_im_idx ORDER BY pos", conn)
+    docs = idx.loc[idx["axis"] == "doc", "label"]
+    terms = idx.loc[idx["axis"] == "term", "label"]
+    coo = pd.read_sql("SELECT * FROM textnet_im_coo", conn)
+    m = coo_array(
+        (
+            coo["value"].to_numpy(dtype="float64"),
+            (coo["row"].to_numpy(dtype="int64"), coo["col"].to_numpy(dtype="int64")),
+        ),
+        shape=(len(docs), len(terms)),
+    )
+    return BiadjacencyMatrix.from_sparse(
+        m,
+        index=pd.Index(docs, name="label"),
+        columns=pd.Index(terms, name="term"),
     )
-    return BiadjacencyMatrix(m.astype("float64"))
 
 
 def _graph_from_matrix(m: BiadjacencyMatrix) -> ig.Graph:
-    g = ig.Graph.Biadjacency(m.to_numpy().tolist(), directed=False, weighted=True)
+    # igraph's Biadjacency constructor only takes dense input, so the edge
+    # list is read off the CSR structure instead.
+    csr = m._sparse
+    doc_count, term_count = csr.shape
+    rows = np.repeat(np.arange(doc_count), np.diff(csr.indptr))
+    edges = np.column_stack([rows, csr.indices + doc_count])
+    g = ig.Graph(n=doc_count + term_count, edges=edges, directed=False)
     g.vs["id"] = np.append(m.index, m.columns).tolist()
-    g.es["cost"] = [1 / pow(w, tn.params["tuning_parameter"]) for w in g.es["weight"]]
-    g.vs["type"] = ["term" if t else "doc" for t in g.vs["type"]]
+    g.vs["type"] = ["doc"] * doc_count + ["term"] * term_count
+    g.es["weight"] = _float_values(csr.data)
+    g.es["cost"] = _float_values(_edge_cost(csr.data))
     return g
 
 
@@ -860,40 +996,108 @@ def disparity_filter(graph: ig.Graph) -> Iterator[float]:
 
     Notes
     -----
-    Provided the package was installed properly, a compiled extension will be
-    used for a significant speedup.
+    The integral in the significance test has a closed form, so scores for
+    all edges are computed in a single vectorized step.
 
     References
     ----------
     :cite:`Serrano2009`
     """
-    tqdm_args = dict(disable=not tn.params["progress_bar"] or None, unit="edges")
-    cores = cpu_count() or 1
-    if cores > 1 and len(graph.es) >= cores:
-        sig_ufunc = np.frompyfunc(_edge_significance, 1, 1)
-        edge_chunks = np.array_split(pd.Series(list(graph.es)), cores)
-        yield from pd.concat(thread_map(sig_ufunc, edge_chunks, **tqdm_args))
-    else:
-        for edge in tqdm(graph.es, **tqdm_args):
-            yield _edge_significance(edge)
-
-
-def _edge_significance(edge: ig.Edge) -> float:
-    source, target = edge.vertex_tuple
-    degree_t = target.degree()
-    degree_s = source.degree()
-    sum_weights_s = source.strength(weights="weight")
-    norm_weight_s = edge["weight"] / sum_weights_s
-    sum_weights_t = target.strength(weights="weight")
-    norm_weight_t = edge["weight"] / sum_weights_t
-    integral_s = _disparity_filter_integral(norm_weight_s, degree_s)
-    integral_t = _disparity_filter_integral(norm_weight_t, degree_t)
-    return min(1 - (degree_s - 1) * integral_s[0], 1 - (degree_t - 1) * integral_t[0])
-
-
-@memoize
-def _disparity_filter_integral(norm_weight: float, degree: int) -> float:
-    return quad(integrand, 0, norm_weight, args=(degree))
+    source, target = np.array(graph.get_edgelist(), dtype=int).reshape(-1, 2).T
+    alpha = _disparity_filter_scores(
+        source,
+        target,
+        np.array(graph.es["weight"], dtype="float64"),
+        np.array(graph.degree()),
+        np.array(graph.strength(weights="weight")),
+    )
+    yield from _float_values(alpha)
+
+
+def _disparity_filter_scores(
+    source: np.ndarray,
+    target: np.ndarray,
+    weight: np.ndarray,
+    degree: np.ndarray,
+    strength: np.ndarray,
+) -> np.ndarray:
+    alpha_s = _disparity_filter_alpha(weight / strength[source], degree[source])
+    alpha_t = _disparity_filter_alpha(weight / strength[target], degree[target])
+    # The test is undefined for leaf nodes, so their edges are judged from the
+    # other endpoint only
+    alpha_s = np.where(degree[source] > 1, alpha_s, 1.0)
+    alpha_t = np.where(degree[target] > 1, alpha_t, 1.0)
+    return np.fmin(alpha_s, alpha_t)
+
+
+def _edge_cost(weights: np.ndarray) -> np.ndarray:
+    return np.reciprocal(np.power(weights, tn.params["tuning_parameter"]))
+
+
+def _float_values(values: np.ndarray) -> array:
+    # Copying the raw buffer into a typed array is cheaper than boxing every
+    # element with ``tolist``, and iterating it still yields Python floats.
+    return array("d", np.ascontiguousarray(values, dtype="float64").tobytes())
+
+
+def _disparity_filter_alpha(norm_weight: np.ndarray, degree: np.ndarray) -> np.ndarray:
+    # 1 - (k - 1) * integral of (1 - x)^(k - 2) from 0 to w = (1 - w)^(k - 1)
+    return (1 - norm_weight) ** (degree - 1)
+
+
+def _partition_graph_cugraph(graph: ig.Graph, seed: int) -> ig.VertexClustering:
+    import cudf
+    import cugraph
+
+    source, target = np.array(graph.get_edgelist(), dtype=int).reshape(-1, 2).T
+    edges = cudf.DataFrame({"src": source, "dst": target, "weight": graph.es["weight"]})
+    g = cugraph.Graph()
+    g.from_cudf_edgelist(
+        edges, source="src", destination="dst", edge_attr="weight", renumber=False
+    )
+    parts, _ = cugraph.leiden(g, random_state=seed)
+    membership = (
+        parts.to_pandas()
+        .set_index("vertex")["partition"]
+        .reindex(range(graph.vcount()))
+    )
+    # Isolated nodes are absent from the edge list and get their own clusters
+    isolated = membership.isna()
+    first_new = membership.fillna(-1).max() + 1
+    membership[isolated] = first_new + np.arange(isolated.sum())
+    return ig.VertexClustering(graph, membership=membership.astype(int).tolist())
+
+
+def _path_centrality(
+    graph: ig.Graph, measure: Literal["betweenness", "closeness"]
+) -> list[float]:
+    cutoff = tn.params["centrality_cutoff"]
+    n_jobs = tn.params["n_jobs"]
+    if n_jobs < 0:
+        n_jobs = cpu_count() or 1
+    n_jobs = min(n_jobs, graph.vcount())
+    # igraph cannot combine a cutoff with a subset of source vertices
+    if n_jobs <= 1 or (measure == "betweenness" and cutoff is not None):
+        return getattr(graph, measure)(weights="cost", cutoff=cutoff)
+    chunks = [c.tolist() for c in np.array_split(range(graph.vcount()), n_jobs)]
+    chunk_func = partial(_path_centrality_chunk, graph, measure, cutoff)
+    with ProcessPoolExecutor(n_jobs) as executor:
+        parts = list(executor.map(chunk_func, chunks))
+    if measure == "betweenness":
+        # Path counts from disjoint sets of sources add up to the total
+        return np.sum(parts, axis=0).tolist()
+    return list(concat(parts))
+
+
+def _path_centrality_chunk(
+    graph: ig.Graph,
+    measure: Literal["betweenness", "closeness"],
+    cutoff: float | None,
+    vertices: list[int],
+) -> list[float]:
+    if measure == "betweenness":
+        return graph.betweenness(sources=vertices, weights="cost")
+    return graph.closeness(vertices=vertices, weights="cost", cutoff=cutoff)
 
 
 def giant_component(g: ig.Graph) -> ig.Graph:
@@ -910,9 +1114,7 @@ def giant_component(g: ig.Graph) -> ig.Graph:
     `igraph.Graph`
         The graph consisting of just the largest connected component.
     """
-    size = max(g.components().sizes())
-    pos = g.components().sizes().index(size)
-    return g.subgraph(g.components()[pos])
+    return g.connected_components().giant()
 
 
 def bipartite_rank(
@@ -1016,7 +1218,7 @@ def bipartite_rank(
         p_last = p
         d_last = d
 
-    return pd.Series(np.append(d, p), index=net.nodes["id"])
+    return pd.Series(np.append(d, p), index=net._ids)
 
 
 def textual_spanning(m: np.ndarray, alpha: float = 1.0) -> np.ndarray:
@@ -1058,4 +1260,76 @@ def textual_spanning(m: np.ndarray, alpha: float = 1.0) -> np.ndarray:
 
 
 class BiadjacencyMatrix(LiteFrame):
-    """Matrix relating documents to terms."""
+    """
+    Matrix relating documents to terms.
+
+    The matrix can be backed by a sparse array, in which case a dense data
+    frame is only allocated once it is needed.
+    """
+
+    _labels: tuple[pd.Index, pd.Index]
+
+    @classmethod
+    def from_sparse(
+        cls, data: sparray, index: pd.Index, columns: pd.Index
+    ) -> BiadjacencyMatrix:
+        """
+        Create matrix from a sparse array without densifying it.
+
+        Parameters
+        ----------
+        data : sparse array
+            Sparse array with documents as rows and terms as columns.
+        index : Index
+            Document labels.
+        columns : Index
+            Term labels.
+
+        Returns
+        -------
+        `BiadjacencyMatrix`
+        """
+        m = cls.__new__(cls)
+        m._sparse = csr_array(data, dtype="float64", copy=True)
+        m._sparse.eliminate_zeros()  # stored zeros would become edges
+        m._labels = (index, columns)
+        return m
+
+    @cached_property
+    def _sparse(self) -> csr_array:
+        return csr_array(self.to_numpy(dtype="float64"))
+
+    @cached_property
+    def _df(self) -> pd.DataFrame:  # type: ignore[override]
+        index, columns = self._labels
+        return pd.DataFrame(self._sparse.toarray(), index=index, columns=columns)
+
+    def _is_dense(self) -> bool:
+        return "_df" in vars(self)
+
+    @property
+    def index(self) -> pd.Index:
+        return self._df.index if self._is_dense() else self._labels[0]
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._df.columns if self._is_dense() else self._labels[1]
+
+    @property
+    def empty(self) -> bool:
+        return self._df.empty if self._is_dense() else 0 in self._sparse.shape
+
+    @property
+    def density(self) -> float:
+        rows, cols = self._sparse.shape
+        if rows * cols == 0:
+            return np.nan
+        return self._sparse.count_nonzero() / (rows * cols)
+
+    def to_sparse_array(self) -> csr_array:
+        """Return CSR sparse array with float32 numeric data."""
+        return self._sparse.astype("float32")
+
+    def __setitem__(self, *args, **kwargs):
+        super().__setitem__(*args, **kwargs)
+        vars(self).pop("_sparse", None)